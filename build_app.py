@@ -2,9 +2,14 @@ import os
 import sys
 import subprocess
 import shutil
+import stat
 import platform
-import multiprocessing
 import datetime
+import hashlib
+import glob
+import re
+from importlib import metadata
+from concurrent.futures import ThreadPoolExecutor
 
 # Application Metadata
 APP_PKG_NAME = "bilibilidown"
@@ -16,10 +21,121 @@ APP_MAINTAINER = "BiliDown Team"
 APP_EMAIL = "zeknes@163.com"
 APP_LICENSE = "MIT"
 APP_URL = "https://github.com/zeknes/bilibilidown-py"
+APP_ICON = "bili.png"
 
-def create_deb(source_dir, output_dir, version=APP_VERSION):
+# Host facts, fixed for the lifetime of the build
+SYSTEM_OS = platform.system()
+CPU_COUNT = os.cpu_count() or 1
+
+def _link_or_copy(src, dst, *, follow_symlinks=True):
+    """Hardlink src to dst, falling back to a real copy (e.g. across filesystems)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+def _copy_if_changed(src, dst):
+    """copy2 src to dst unless dst already matches it by size and mtime"""
+    src_st = os.stat(src)
+    try:
+        dst_st = os.stat(dst)
+        if dst_st.st_size == src_st.st_size and dst_st.st_mtime_ns == src_st.st_mtime_ns:
+            return
+    except FileNotFoundError:
+        pass
+    # shutil's copyfile already uses sendfile (Linux) / fcopyfile (macOS) under the hood
+    shutil.copy2(src, dst)
+
+def _iter_tree(root):
+    """Yield (relative_path, stat) for every non-directory entry under root, without following symlinks"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield os.path.relpath(entry.path, root), entry.stat(follow_symlinks=False)
+
+def _inputs_digest(inputs, version=APP_VERSION):
     """
-    Create a .deb package for Linux distribution (supports both dpkg-deb and manual ar method)
+    Fingerprint packaging inputs: file contents for plain files,
+    relative path + size + mtime for directory trees (hashing a whole dist tree is too slow).
+    This script is always included, since the control/spec/.desktop templates and APP_* metadata live here.
+    """
+    h = hashlib.sha256(f"{version}-{APP_RELEASE}|{sys.version}".encode())
+    with open(os.path.abspath(__file__), "rb") as f:
+        h.update(hashlib.sha256(f.read()).digest())
+    for path in inputs:
+        h.update(path.encode())
+        if os.path.isdir(path):
+            for rel, st in sorted(_iter_tree(path)):
+                h.update(f"{rel}|{st.st_size}|{st.st_mtime_ns}".encode())
+        elif os.path.isfile(path):
+            with open(path, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+def _is_up_to_date(stamp_path, digest):
+    """True if the stamp records this digest and every artifact listed in it still exists"""
+    try:
+        with open(stamp_path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return False
+    return bool(lines) and lines[0] == digest and all(os.path.exists(p) for p in lines[1:])
+
+def _write_stamp(stamp_path, digest, artifacts):
+    with open(stamp_path, "w") as f:
+        f.write("\n".join([digest, *artifacts]) + "\n")
+
+def _installed_versions():
+    """name==version for Nuitka and every package in requirements.txt (which is unpinned), as installed right now"""
+    names = ["Nuitka"]
+    try:
+        with open("requirements.txt") as f:
+            for line in f:
+                name = re.split(r"[\s\[<>=!~;#]", line.strip(), maxsplit=1)[0]
+                if name:
+                    names.append(name)
+    except OSError:
+        pass
+    versions = []
+    for name in names:
+        try:
+            versions.append(f"{name}=={metadata.version(name)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{name}==missing")
+    return ",".join(versions)
+
+def _build_key(cmd):
+    """Digest of the app sources, icon, requirements list, installed library versions and the exact Nuitka command line"""
+    sources = sorted(glob.glob("*.py")) + [APP_ICON, "requirements.txt"]
+    return hashlib.sha256(f"{_inputs_digest(sources)}|{_installed_versions()}|{' '.join(cmd)}".encode()).hexdigest()
+
+def _ar_header(name, size):
+    """60-byte ar(1) member header as used inside .deb files"""
+    mtime = int(datetime.datetime.now().timestamp())
+    return f"{name:<16}{mtime:<12}{0:<6}{0:<6}{'100644':<8}{size:<10}`\n".encode("ascii")
+
+def _write_ar_member(f, name, data):
+    f.write(_ar_header(name, len(data)))
+    f.write(data)
+    if len(data) % 2:
+        f.write(b"\n")
+
+def _dpkg_deb_supports_zstd():
+    """True if this dpkg-deb lists zstd among its -Z compressors (dpkg >= 1.21.18)"""
+    try:
+        result = subprocess.run(["dpkg-deb", "--help"], stdout=subprocess.PIPE, text=True)
+    except OSError:
+        return False
+    return "zstd" in result.stdout
+
+def create_deb(source_dir, output_dir, version=APP_VERSION, zstd=False):
+    """
+    Create a .deb package for Linux distribution (supports both dpkg-deb and manual ar method).
+    zstd=True (opt-in via --deb-zstd) is faster, but such packages need dpkg >= 1.21.18 on the target (not Debian 11 / Ubuntu 20.04)
     """
     print("\n=== Creating DEB Package ===")
     
@@ -32,6 +148,18 @@ def create_deb(source_dir, output_dir, version=APP_VERSION):
     else:
         deb_arch = arch
 
+    deb_filename = f"{APP_PKG_NAME}_{version}-{APP_RELEASE}_{deb_arch}.deb"
+    deb_path = os.path.join(output_dir, deb_filename)
+
+    # Skip when neither the dist tree nor the icon changed since the last package
+    stamp_path = os.path.join(output_dir, ".deb.inputs")
+    digest = _inputs_digest([source_dir, APP_ICON], version)
+    # The compressor changes the package too
+    digest = hashlib.sha256(f"{digest}|zstd={zstd}".encode()).hexdigest()
+    if _is_up_to_date(stamp_path, digest):
+        print(f"✅ DEB package up-to-date: {deb_path}")
+        return
+
     # Setup build directories
     build_root = os.path.join(output_dir, "deb_build")
     if os.path.exists(build_root):
@@ -46,10 +174,10 @@ def create_deb(source_dir, output_dir, version=APP_VERSION):
     for d in [deb_opt, deb_bin, deb_desktop, deb_icon, deb_debian]:
         os.makedirs(d, exist_ok=True)
     
-    # Copy application files
-    print(f"   Copying application files from {source_dir}...")
+    # Stage application files (hardlinked, the package only needs directory entries)
+    print(f"   Staging application files from {source_dir}...")
     if os.path.isdir(source_dir):
-        shutil.copytree(source_dir, deb_opt, dirs_exist_ok=True)
+        shutil.copytree(source_dir, deb_opt, dirs_exist_ok=True, copy_function=_link_or_copy)
     else:
         shutil.copy2(source_dir, deb_opt)
         
@@ -83,16 +211,11 @@ Keywords=bilibili;video;download;
 """)
         
     # Copy icon
-    if os.path.exists("bili.png"):
-        shutil.copy2("bili.png", os.path.join(deb_icon, f"{APP_PKG_NAME}.png"))
+    if os.path.isfile(APP_ICON):
+        shutil.copy2(APP_ICON, os.path.join(deb_icon, f"{APP_PKG_NAME}.png"))
         
-    # Calculate installed size
-    total_size = 0
-    for dirpath, dirnames, filenames in os.walk(deb_opt):
-        for filename in filenames:
-            filepath = os.path.join(dirpath, filename)
-            if not os.path.islink(filepath):
-                total_size += os.path.getsize(filepath)
+    # Calculate installed size (scandir reuses the directory entry's stat, symlinks excluded)
+    total_size = sum(st.st_size for _, st in _iter_tree(deb_opt) if not stat.S_ISLNK(st.st_mode))
     installed_size = total_size // 1024
     
     # Create control file
@@ -119,62 +242,69 @@ exit 0
 """)
     os.chmod(postinst_path, 0o755)
 
-    deb_filename = f"{APP_PKG_NAME}_{version}-{APP_RELEASE}_{deb_arch}.deb"
-    deb_path = os.path.join(output_dir, deb_filename)
-
-    # Try dpkg-deb first
+    # Try dpkg-deb first, with the dpkg default compressor unless zstd was asked for
     if shutil.which("dpkg-deb"):
+        compress_args = []
+        if zstd:
+            if _dpkg_deb_supports_zstd():
+                compress_args = ["-Zzstd"]
+            else:
+                print("   ⚠️ dpkg-deb has no zstd support, using default compression...")
         try:
-            subprocess.run(["dpkg-deb", "--build", build_root, deb_path], check=True)
+            subprocess.run(["dpkg-deb", *compress_args, "--build", build_root, deb_path], check=True)
             print(f"✅ DEB package created: {deb_path}")
+            _write_stamp(stamp_path, digest, [deb_path])
             shutil.rmtree(build_root)
             return
         except subprocess.CalledProcessError:
             print("⚠️ dpkg-deb failed, trying manual method...")
     
-    # Manual fallback using ar/tar
+    # Manual fallback: write the ar container ourselves, streaming tar straight into it
     print("   Using manual construction (ar + tar)...")
     try:
-        # Create data.tar.gz
-        data_tar = os.path.join(output_dir, "data.tar.gz")
-        subprocess.run([
-            "tar", "-czf", data_tar,
-            "-C", build_root,
-            "--exclude=DEBIAN", "."
-        ], check=True)
-        
-        # Create control.tar.gz
-        control_tar = os.path.join(output_dir, "control.tar.gz")
-        subprocess.run([
-            "tar", "-czf", control_tar,
+        # Pick a multithreaded compressor when available (data.tar.zst needs dpkg >= 1.21.18, so opt-in only)
+        if zstd and shutil.which("zstd"):
+            compress_prog, tar_ext = "zstd -T0", "zst"
+        elif shutil.which("pigz"):
+            compress_prog, tar_ext = "pigz", "gz"
+        else:
+            compress_prog, tar_ext = "gzip", "gz"
+
+        # control.tar.* is tiny, keep it in memory
+        control_tar = subprocess.run([
+            "tar", f"--use-compress-program={compress_prog}", "-cf", "-",
             "-C", deb_debian, "."
-        ], check=True)
-        
-        # Create debian-binary
-        debian_binary = os.path.join(output_dir, "debian-binary")
-        with open(debian_binary, 'w') as f:
-            f.write("2.0\n")
-            
-        # Combine with ar
-        if shutil.which("ar"):
-            if os.path.exists(deb_path):
-                os.remove(deb_path)
+        ], check=True, stdout=subprocess.PIPE).stdout
+
+        with open(deb_path, "wb") as deb:
+            deb.write(b"!<arch>\n")
+            _write_ar_member(deb, "debian-binary", b"2.0\n")
+            _write_ar_member(deb, f"control.tar.{tar_ext}", control_tar)
+
+            # data.tar.* is streamed into the package; its header is patched once the size is known
+            header_pos = deb.tell()
+            deb.write(_ar_header(f"data.tar.{tar_ext}", 0))
+            deb.flush()
             subprocess.run([
-                "ar", "r", deb_path,
-                debian_binary, control_tar, data_tar
-            ], check=True)
-            print(f"✅ DEB package created (manual): {deb_path}")
-        else:
-            print("❌ 'ar' utility not found. Cannot create DEB package.")
-            
-        # Cleanup temp files
-        for f in [data_tar, control_tar, debian_binary]:
-            if os.path.exists(f):
-                os.remove(f)
+                "tar", f"--use-compress-program={compress_prog}", "-cf", "-",
+                "-C", build_root,
+                "--exclude=DEBIAN", "."
+            ], check=True, stdout=deb)
+            data_end = deb.seek(0, os.SEEK_END)
+            data_size = data_end - header_pos - 60
+            if data_size % 2:
+                deb.write(b"\n")
+            deb.seek(header_pos)
+            deb.write(_ar_header(f"data.tar.{tar_ext}", data_size))
+
+        print(f"✅ DEB package created (manual): {deb_path}")
+        _write_stamp(stamp_path, digest, [deb_path])
         shutil.rmtree(build_root)
             
     except Exception as e:
         print(f"❌ Failed to create DEB package: {e}")
+        if os.path.exists(deb_path):
+            os.remove(deb_path)
 
 def create_rpm(source_dir, output_dir, version=APP_VERSION):
     """
@@ -186,6 +316,13 @@ def create_rpm(source_dir, output_dir, version=APP_VERSION):
         print("⚠️ 'rpmbuild' not found. Skipping RPM creation.")
         return
 
+    # Skip when neither the dist tree nor the icon changed since the last package
+    stamp_path = os.path.join(output_dir, ".rpm.inputs")
+    digest = _inputs_digest([source_dir, APP_ICON], version)
+    if _is_up_to_date(stamp_path, digest):
+        print("✅ RPM package up-to-date")
+        return
+
     # RPM build structure
     rpm_root = os.path.join(output_dir, "rpm_build")
     if os.path.exists(rpm_root):
@@ -199,6 +336,11 @@ def create_rpm(source_dir, output_dir, version=APP_VERSION):
     
     # Determine architecture
     arch = platform.machine()
+
+    # Absolute paths referenced from the spec file
+    source_abs = os.path.abspath(source_dir)
+    icon_abs = os.path.abspath(APP_ICON)
+    rpm_topdir = os.path.abspath(rpm_root)
     
     # We will simply copy the binaries in %install, no need for Source0 tarball
     # This is a binary repackaging
@@ -231,8 +373,9 @@ mkdir -p %{{buildroot}}/usr/share/applications
 mkdir -p %{{buildroot}}/usr/share/pixmaps
 
 # Copy application files
-# We need to copy from the external source directory
-cp -a {os.path.abspath(source_dir)}/* %{{buildroot}}/opt/{APP_PKG_NAME}/
+# We need to copy from the external source directory. Never hardlink: rpmbuild's post-install
+# strip/debugedit rewrite files in place and would alter the dist tree (and the DEB built from it)
+cp -a --reflink=auto {source_abs}/* %{{buildroot}}/opt/{APP_PKG_NAME}/
 
 # Ensure main is executable
 chmod 755 %{{buildroot}}/opt/{APP_PKG_NAME}/main
@@ -261,8 +404,8 @@ Keywords=bilibili;video;download;
 EOF
 
 # Copy icon
-if [ -f "{os.path.abspath('bili.png')}" ]; then
-    cp "{os.path.abspath('bili.png')}" %{{buildroot}}/usr/share/pixmaps/{APP_PKG_NAME}.png
+if [ -f "{icon_abs}" ]; then
+    cp "{icon_abs}" %{{buildroot}}/usr/share/pixmaps/{APP_PKG_NAME}.png
 fi
 
 %files
@@ -281,13 +424,13 @@ fi
     try:
         subprocess.check_call([
             "rpmbuild", 
-            "--define", f"_topdir {os.path.abspath(rpm_root)}", 
+            "--define", f"_topdir {rpm_topdir}", 
             "-bb", spec_file
         ], stdout=subprocess.DEVNULL) # Suppress verbose output
         
         # Find and move RPM
         rpms_dir = os.path.join(rpm_root, "RPMS")
-        found = False
+        built = []
         for root, dirs, files in os.walk(rpms_dir):
             for file in files:
                 if file.endswith(".rpm"):
@@ -295,9 +438,11 @@ fi
                     dst = os.path.join(output_dir, file)
                     shutil.move(src, dst)
                     print(f"✅ RPM package created: {dst}")
-                    found = True
+                    built.append(dst)
         
-        if not found:
+        if built:
+            _write_stamp(stamp_path, digest, built)
+        else:
             print("❌ RPM build finished but no .rpm file found.")
             
         # Cleanup
@@ -318,14 +463,18 @@ def create_dmg(app_path):
     dmg_path = os.path.join(os.path.dirname(app_path), dmg_name)
     
     if os.path.exists(dmg_path):
+        # create-dmg mounts, copies and compresses the whole bundle; skip it when nothing changed
+        newest_input = max([os.path.getmtime(APP_ICON)] +
+                           [st.st_mtime for _, st in _iter_tree(app_path)])
+        if os.path.getmtime(dmg_path) >= newest_input:
+            print(f"✅ DMG up-to-date: {dmg_path}")
+            return
         os.remove(dmg_path)
         
     print(f"📦 Creating DMG installer: {dmg_name}...")
     
     # Check if create-dmg is installed
-    try:
-        subprocess.check_call(["which", "create-dmg"], stdout=subprocess.DEVNULL)
-    except subprocess.CalledProcessError:
+    if not shutil.which("create-dmg"):
         print("⚠️ 'create-dmg' tool not found. Skipping DMG creation.")
         print("💡 Run 'brew install create-dmg' to enable this feature.")
         return
@@ -333,7 +482,7 @@ def create_dmg(app_path):
     cmd = [
         "create-dmg",
         "--volname", "BiliDown Installer",
-        "--volicon", "bili.png",
+        "--volicon", APP_ICON,
         "--window-pos", "200", "120",
         "--window-size", "800", "400",
         "--icon-size", "100",
@@ -354,12 +503,17 @@ def build():
     print("🚀 Starting Nuitka build...")
     
     # Detect OS
-    system_os = platform.system()
+    system_os = SYSTEM_OS
     print(f"💻 Detected OS: {system_os}")
     
-    # Get CPU count for parallel compilation
-    n_cores = multiprocessing.cpu_count()
-    print(f"🔥 Using {n_cores} cores for compilation")
+    # Get CPU count for parallel compilation; leave two cores free so the C compiler
+    # jobs don't starve the machine of memory bandwidth (override via MAX_JOBS)
+    max_jobs = os.environ.get("MAX_JOBS", "").strip()
+    if max_jobs.isdigit() and int(max_jobs) > 0:
+        n_cores = int(max_jobs)
+    else:
+        n_cores = max(1, CPU_COUNT - 2)
+    print(f"🔥 Using {n_cores} cores for compilation (override via MAX_JOBS)")
 
     # Base command
     cmd = [
@@ -370,9 +524,24 @@ def build():
         "--show-memory",
         f"--jobs={n_cores}",          # Enable parallel compilation
         "--output-dir=dist_nuitka",
-        "--include-data-file=bili.png=bili.png",
+        f"--include-data-file={APP_ICON}={APP_ICON}",
         "--main=main.py",
     ]
+
+    # LTO dominates the C-compile tail and defeats the compiler cache, so it is reserved for releases
+    if "--release" in sys.argv:
+        cmd.append("--lto=yes")
+    else:
+        cmd.append("--lto=no")
+
+    # Single-file output adds a compression pass at the end, so it is opt-in
+    onefile = "--onefile" in sys.argv and system_os != "Darwin"
+    if onefile:
+        cmd.append("--onefile")
+
+    # Clang is the faster C frontend; Nuitka already uses it on macOS
+    if system_os == "Linux" and shutil.which("clang"):
+        cmd.append("--clang")
     
     # OS-specific flags
     output_artifact = ""
@@ -381,7 +550,7 @@ def build():
         cmd.extend([
             "--macos-create-app-bundle",
             "--macos-app-name=BiliDown",
-            "--macos-app-icon=bili.png",
+            f"--macos-app-icon={APP_ICON}",  # Nuitka converts the PNG to .icns itself, no pre-generation needed
             "--disable-console",
         ])
         output_artifact = "BiliDown.app"
@@ -396,26 +565,60 @@ def build():
         # We can try to use --onefile if preferred, but standalone is safer for PySide6
         # Adding icon if supported by desktop environment integration
         cmd.extend([
-            "--linux-icon=bili.png",
+            f"--linux-icon={APP_ICON}",
         ])
-        output_artifact = "main.dist/main" # Nuitka default output name in standalone mode
+        # Nuitka default output names: onefile binary in the output dir, or main.dist/ in standalone mode
+        output_artifact = "main.bin" if onefile else "main.dist/main"
         
     elif system_os == "Windows":
         cmd.extend([
-            "--windows-icon-from-ico=bili.png", # Nuitka might auto-convert or need .ico
+            f"--windows-icon-from-ico={APP_ICON}", # Nuitka might auto-convert or need .ico
             "--disable-console",
         ])
-        output_artifact = "main.dist\\main.exe"
+        output_artifact = "main.exe" if onefile else "main.dist\\main.exe"
+
+    # Compiler cache: let unchanged generated C hit the cache on rebuilds
+    env = os.environ.copy()
+    # Keep Nuitka's own caches in a stable, repo-local place (survives /tmp wipes, easy to archive in CI)
+    nuitka_cache = env.setdefault("NUITKA_CACHE_DIR", os.path.abspath(".nuitka_cache"))
+    os.makedirs(nuitka_cache, exist_ok=True)
+    # Parallelism comes from --jobs; stop OpenMP-using build deps from multiplying it
+    env.setdefault("OMP_NUM_THREADS", "1")
+    if system_os == "Windows":
+        # Nuitka needs a clcache-compatible binary here, so sccache is not a drop-in substitute
+        clcache = shutil.which("clcache")
+        if clcache:
+            env.setdefault("NUITKA_CLCACHE_BINARY", clcache)
+            print(f"⚡ Using compiler cache: {clcache}")
+    else:
+        ccache = shutil.which("ccache")
+        if ccache:
+            env.setdefault("NUITKA_CCACHE_BINARY", ccache)
+            # Nuitka wraps the compiler, so compare by content rather than mtime
+            env.setdefault("CCACHE_COMPILERCHECK", "content")
+            env.setdefault("CCACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "bilidown-ccache"))
+            env.setdefault("CCACHE_MAXSIZE", "2G")
+            print(f"⚡ Using compiler cache: {ccache}")
+
+    dist_dir = os.path.join(os.getcwd(), 'dist_nuitka')
+    artifact_path = os.path.join(dist_dir, output_artifact)
+    build_key = _build_key(cmd)
+    key_file = os.path.join(dist_dir, ".build_key")
 
-    print(f"Running command: {' '.join(cmd)}")
-    
     try:
-        subprocess.check_call(cmd)
-        print("\n✅ Build successful!")
+        if _is_up_to_date(key_file, build_key):
+            print("\n✅ Build up-to-date, skipping Nuitka compile.")
+        else:
+            # Only the final output is refreshed; main.build keeps Nuitka's cache
+            stale_dist = os.path.join(dist_dir, "main.dist")
+            if os.path.exists(stale_dist):
+                shutil.rmtree(stale_dist)
+
+            print(f"Running command: {' '.join(cmd)}")
+            subprocess.check_call(cmd, env=env)
+            print("\n✅ Build successful!")
         
         # Determine actual artifact path
-        dist_dir = os.path.join(os.getcwd(), 'dist_nuitka')
-        artifact_path = os.path.join(dist_dir, output_artifact)
         
         if system_os == "Darwin":
              # Check if Nuitka created main.app instead of BiliDown.app
@@ -424,7 +627,7 @@ def build():
                 print(f"⚠️ Nuitka created 'main.app', renaming to '{output_artifact}'...")
                 shutil.move(fallback_path, artifact_path)
                 
-        elif system_os == "Linux":
+        elif system_os == "Linux" and not onefile:
             # Check if Nuitka created main.bin instead of main
             # We need to ensure the binary is named 'main' because our .desktop files and scripts expect it
             dist_folder = os.path.join(dist_dir, "main.dist")
@@ -435,6 +638,11 @@ def build():
                  print("⚠️ Nuitka created 'main.bin', renaming to 'main'...")
                  shutil.move(binary_bin_path, binary_path)
 
+        if not os.path.exists(artifact_path):
+            print(f"❌ Expected build output not found: {artifact_path}")
+            sys.exit(1)
+
+        _write_stamp(key_file, build_key, [artifact_path])
         print(f"Artifact location: {artifact_path}")
         
         # Bundle ffmpeg
@@ -445,15 +653,15 @@ def build():
                 # For macOS .app, put in Contents/MacOS
                 dest_dir = os.path.join(artifact_path, "Contents", "MacOS")
                 os.makedirs(dest_dir, exist_ok=True)
-                shutil.copy2(ffmpeg_src, os.path.join(dest_dir, "ffmpeg"))
+                _copy_if_changed(ffmpeg_src, os.path.join(dest_dir, "ffmpeg"))
             elif system_os == "Linux":
-                # For Linux, put in main.dist
+                # For Linux, put next to the binary (main.dist, or dist_nuitka for onefile)
                 dest_dir = os.path.dirname(artifact_path)
-                shutil.copy2(ffmpeg_src, os.path.join(dest_dir, "ffmpeg"))
+                _copy_if_changed(ffmpeg_src, os.path.join(dest_dir, "ffmpeg"))
             elif system_os == "Windows":
-                 # For Windows, put in main.dist
+                 # For Windows, put next to the binary (main.dist, or dist_nuitka for onefile)
                  dest_dir = os.path.dirname(artifact_path)
-                 shutil.copy2(ffmpeg_src, os.path.join(dest_dir, "ffmpeg.exe"))
+                 _copy_if_changed(ffmpeg_src, os.path.join(dest_dir, "ffmpeg.exe"))
             print(f"✅ ffmpeg bundled from {ffmpeg_src}")
         else:
             print("⚠️ ffmpeg not found in PATH. It will not be bundled.")
@@ -462,12 +670,20 @@ def build():
         if system_os == "Darwin" and output_artifact.endswith(".app"):
             create_dmg(artifact_path)
             
-        # Create DEB and RPM for Linux
-        if system_os == "Linux":
+        # Create DEB and RPM for Linux (they package the standalone main.dist tree)
+        if system_os == "Linux" and onefile:
+            print("⚠️ --onefile produces a single binary; DEB/RPM packaging needs the standalone build, skipping.")
+        elif system_os == "Linux":
             # For Linux standalone, we package the whole 'main.dist' directory
             dist_folder = os.path.join(dist_dir, "main.dist")
-            create_deb(dist_folder, dist_dir)
-            create_rpm(dist_folder, dist_dir)
+            # Both packagers are subprocess-bound and stage into separate directories
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [
+                    pool.submit(create_deb, dist_folder, dist_dir, zstd="--deb-zstd" in sys.argv),
+                    pool.submit(create_rpm, dist_folder, dist_dir),
+                ]
+                for future in futures:
+                    future.result()
         
         # Open the output folder
         output_dir = dist_dir
@@ -486,10 +702,11 @@ def build():
         sys.exit(1)
 
 if __name__ == "__main__":
-    # Clean previous build
-    if os.path.exists("dist_nuitka"):
-        shutil.rmtree("dist_nuitka")
-    if os.path.exists("main.build"):
-        shutil.rmtree("main.build")
-        
+    if "--clean" in sys.argv:
+        # Full clean build: drop Nuitka's module cache as well
+        if os.path.exists("dist_nuitka"):
+            shutil.rmtree("dist_nuitka")
+        if os.path.exists("main.build"):
+            shutil.rmtree("main.build")
+
     build()
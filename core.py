@@ -1,12 +1,102 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+import socket
 import re
 import os
 import sys
-import subprocess
 import time
-import qrcode
-import pickle
-from io import BytesIO
+import threading
+from functools import lru_cache
+from http.cookiejar import MozillaCookieJar
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+try:
+    # Optional: several times faster on the large playurl/DASH payloads
+    from orjson import loads as _json_loads, dumps as _json_dumps
+except ImportError:
+    from json import loads as _json_loads, dumps as _dumps
+    def _json_dumps(obj):
+        return _dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# BV IDs are "BV" followed by 10 base58-style characters
+_BV_RE = re.compile(r'BV[0-9A-Za-z]{10}')
+
+# Signed stream URLs carry their expiry as a unix timestamp
+_DEADLINE_RE = re.compile(r'[?&]deadline=(\d+)')
+
+# (connect, read) seconds for JSON API calls, so a stalled endpoint cannot wedge a worker thread
+_API_TIMEOUT = (5, 15)
+
+# 1 MiB reads keep the download loop (and progress callbacks) off the hot path
+_CHUNK_SIZE = 1 << 20
+
+# Large files are fetched as this many parallel byte ranges; below the threshold one stream is as fast
+_RANGE_PARTS = 4
+_RANGE_MIN_SIZE = 8 << 20
+
+# Video info survives restarts for an hour, one JSON file per BV ID
+_INFO_DISK_TTL = 3600
+
+def _preallocate(f, size):
+    """Reserve size bytes for the open file f up front (fewer extents, no growth metadata updates per write)"""
+    if size and hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            pass # Filesystem without fallocate support: just grow as we write
+
+def _safe_unlink(path):
+    """Remove path if it exists (one syscall, no exists/remove race)"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _parse_json(response):
+    """Decode a JSON API response straight from its raw bytes"""
+    return _json_loads(response.content)
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets use TCP keepalive (urllib3 already sets TCP_NODELAY)"""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+class _TTLCache:
+    """Tiny in-memory cache whose entries expire after ttl seconds; oldest entries go first beyond maxsize.
+    Thread-safe: batch lookups read and fill it from pool threads."""
+    def __init__(self, ttl, maxsize=32):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self.entries.pop(key, None)
+            if len(self.entries) >= self.maxsize:
+                del self.entries[next(iter(self.entries))]
+            self.entries[key] = (expires, value)
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key satisfies predicate"""
+        with self._lock:
+            for key in [k for k in self.entries if predicate(k)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
 
 class BiliAuthenticator:
     def __init__(self, session):
@@ -16,8 +106,8 @@ class BiliAuthenticator:
     def get_login_qrcode(self):
         """Get QR code url and key"""
         url = "https://passport.bilibili.com/x/passport-login/web/qrcode/generate"
-        response = self.session.get(url)
-        data = response.json()
+        response = self.session.get(url, timeout=_API_TIMEOUT)
+        data = _parse_json(response)
         if data['code'] == 0:
             self.qrcode_key = data['data']['qrcode_key']
             return data['data']['url']
@@ -25,6 +115,15 @@ class BiliAuthenticator:
 
     def get_qrcode_image(self, url):
         """Generate QR code image from URL"""
+        return BiliAuthenticator._render_qrcode(url)
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _render_qrcode(url):
+        """PNG bytes for url; memoized since the same URL renders identically"""
+        # qrcode pulls in PIL; only pay for that import when the login dialog opens
+        import qrcode
+        from io import BytesIO
         qr = qrcode.QRCode(box_size=10, border=1)
         qr.add_data(url)
         qr.make(fit=True)
@@ -47,8 +146,8 @@ class BiliAuthenticator:
             raise Exception("No QR code key")
             
         url = f"https://passport.bilibili.com/x/passport-login/web/qrcode/poll?qrcode_key={self.qrcode_key}"
-        response = self.session.get(url)
-        data = response.json()
+        response = self.session.get(url, timeout=_API_TIMEOUT)
+        data = _parse_json(response)
         
         if data['code'] == 0:
             code = data['data']['code']
@@ -66,35 +165,114 @@ class BiliDownloader:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Larger keep-alive pool (API + concurrent stream downloads) and retries on transient 5xx
+        adapter = _KeepAliveAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.authenticator = BiliAuthenticator(self.session)
         
+        # API responses are reused for a while; play URLs only until shortly before their signed deadline
+        self._info_cache = _TTLCache(600)
+        self._play_cache = _TTLCache(60)
+        self._dirs_made = set()
+        
         # Save cookies in user home directory to ensure persistence across app moves
         home_dir = os.path.expanduser("~")
         config_dir = os.path.join(home_dir, ".bilibilidown")
         if not os.path.exists(config_dir):
             os.makedirs(config_dir)
             
-        self.cookie_file = os.path.join(config_dir, "cookies.pkl")
+        self.cookie_file = os.path.join(config_dir, "cookies.txt")
+        self.legacy_cookie_file = os.path.join(config_dir, "cookies.pkl")
+        self.info_cache_dir = os.path.join(config_dir, "infocache")
         self.load_cookies()
+        self._prune_disk_info()
 
     def save_cookies(self):
         try:
-            with open(self.cookie_file, 'wb') as f:
-                pickle.dump(self.session.cookies, f)
+            jar = MozillaCookieJar(self.cookie_file)
+            for cookie in self.session.cookies:
+                jar.set_cookie(cookie)
+            jar.save(ignore_discard=True, ignore_expires=True)
         except Exception as e:
             print(f"Failed to save cookies: {e}")
 
     def load_cookies(self):
         if os.path.exists(self.cookie_file):
             try:
-                with open(self.cookie_file, 'rb') as f:
-                    self.session.cookies.update(pickle.load(f))
+                jar = MozillaCookieJar(self.cookie_file)
+                jar.load(ignore_discard=True, ignore_expires=True)
+                self.session.cookies.update(jar)
             except Exception as e:
                 print(f"Failed to load cookies: {e}")
+        elif os.path.exists(self.legacy_cookie_file):
+            self._migrate_legacy_cookies()
+
+    def _migrate_legacy_cookies(self):
+        """One-time conversion of the old pickled cookie jar to the text format"""
+        import pickle
+        try:
+            with open(self.legacy_cookie_file, 'rb') as f:
+                self.session.cookies.update(pickle.load(f))
+            self.save_cookies()
+            os.remove(self.legacy_cookie_file)
+        except Exception as e:
+            print(f"Failed to migrate cookies: {e}")
+
+    def clear_cache(self):
+        """Drop cached API responses (available qualities depend on the login state)"""
+        self._info_cache.clear()
+        self._play_cache.clear()
+        self._prune_disk_info(0)
+
+    def _info_cache_path(self, bvid):
+        return os.path.join(self.info_cache_dir, bvid + ".json")
+
+    def _load_disk_info(self, bvid):
+        """Video info saved by an earlier run, or None if missing, stale or unreadable"""
+        path = self._info_cache_path(bvid)
+        try:
+            if time.time() - os.stat(path).st_mtime >= _INFO_DISK_TTL:
+                return None
+            with open(path, 'rb') as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _store_disk_info(self, bvid, info):
+        """Write info atomically so concurrent lookups never read a half-written file"""
+        path = self._info_cache_path(bvid)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            self._ensure_dir(self.info_cache_dir)
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(info))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Failed to cache video info: {e}")
+
+    def _prune_disk_info(self, max_age=_INFO_DISK_TTL):
+        """Delete cached video info older than max_age seconds (0 clears everything)"""
+        cutoff = time.time() - max_age
+        try:
+            with os.scandir(self.info_cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.stat().st_mtime <= cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
 
     def logout(self):
         """Logout by clearing cookies"""
         self.session.cookies.clear()
+        self.clear_cache()
         if os.path.exists(self.cookie_file):
             try:
                 os.remove(self.cookie_file)
@@ -105,13 +283,14 @@ class BiliDownloader:
         """Get logged in user info (nav endpoint)"""
         url = "https://api.bilibili.com/x/web-interface/nav"
         try:
-            response = self.session.get(url)
-            data = response.json()
+            response = self.session.get(url, timeout=_API_TIMEOUT)
+            data = _parse_json(response)
             if data['code'] == 0:
                 if data['data']['isLogin']:
                     return data['data']
             return None
-        except:
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Failed to check login status: {e}")
             return None
 
     def get_video_info(self, url_or_bvid):
@@ -119,21 +298,36 @@ class BiliDownloader:
         if not bvid:
             raise ValueError("Invalid URL or BVID")
         
+        cached = self._info_cache.get(bvid)
+        if cached is not None:
+            return cached
+        
+        cached = self._load_disk_info(bvid)
+        if cached is not None:
+            self._info_cache.set(bvid, cached)
+            return cached
+        
         api_url = f"https://api.bilibili.com/x/web-interface/view?bvid={bvid}"
-        response = self.session.get(api_url)
-        data = response.json()
+        response = self.session.get(api_url, timeout=_API_TIMEOUT)
+        data = _parse_json(response)
         
         if data['code'] != 0:
             raise Exception(f"API Error: {data['message']}")
             
+        self._info_cache.set(bvid, data['data'])
+        self._store_disk_info(bvid, data['data'])
         return data['data']
 
     def get_play_url(self, bvid, cid, qn=80):
         # qn: 127=8K, 120=4K, 116=1080P60, 80=1080P, 64=720P
         # fnval=4048 (4K)
+        cached = self._play_cache.get((bvid, cid, qn))
+        if cached is not None:
+            return cached
+        
         api_url = f"https://api.bilibili.com/x/player/playurl?bvid={bvid}&cid={cid}&qn={qn}&fnval=4048&fourk=1"
-        response = self.session.get(api_url)
-        data = response.json()
+        response = self.session.get(api_url, timeout=_API_TIMEOUT)
+        data = _parse_json(response)
         
         if data['code'] != 0:
             raise Exception(f"API Error: {data['message']}")
@@ -144,29 +338,165 @@ class BiliDownloader:
             # or simply return all data and let GUI decide, but here we update logic
             pass
             
+        self._play_cache.set((bvid, cid, qn), data['data'], self._play_url_ttl(data['data']))
         return data['data']
 
+    def _play_url_ttl(self, play_info):
+        """Seconds the play info stays usable: up to 90 min, ending 5 min before the stream URLs' deadline"""
+        if play_info.get('dash') and play_info['dash'].get('video'):
+            url = play_info['dash']['video'][0]['base_url']
+        elif play_info.get('durl'):
+            url = play_info['durl'][0]['url']
+        else:
+            return None
+        match = _DEADLINE_RE.search(url)
+        if not match:
+            return None
+        return max(0, min(90 * 60, int(match.group(1)) - time.time() - 300))
+
+    def invalidate_play_url(self, bvid, cid):
+        """Forget cached play info for a video, e.g. after its stream URLs were rejected"""
+        self._play_cache.invalidate(lambda key: key[:2] == (bvid, cid))
+
     def _extract_bvid(self, text):
-        match = re.search(r'(BV\w+)', text)
+        match = _BV_RE.search(text)
         if match:
-            return match.group(1)
+            return match.group(0)
         return text if text.startswith('BV') else None
 
-    def download_file(self, url, filepath, progress_callback=None):
-        response = self.session.get(url, stream=True)
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 1024
-        wrote = 0
-        
+    def download_file(self, url, filepath, progress_callback=None, chunk_size=_CHUNK_SIZE):
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        self._ensure_dir(os.path.dirname(os.path.abspath(filepath)))
         
+        total_size = self._probe_range_size(url)
+        if total_size and total_size >= _RANGE_MIN_SIZE:
+            self._download_ranges(url, filepath, total_size, progress_callback, chunk_size)
+        else:
+            self._download_stream(url, filepath, progress_callback, chunk_size)
+
+    def _probe_range_size(self, url):
+        """Total size of url if the server honours byte ranges, else None"""
+        try:
+            # stream=True: a server that ignores Range answers 200 and we must not pull the whole body here
+            with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=10) as response:
+                total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                if response.status_code == 206 and total.isdigit():
+                    return int(total)
+        except requests.RequestException:
+            pass
+        return None
+
+    def _download_ranges(self, url, filepath, total_size, progress_callback=None, chunk_size=_CHUNK_SIZE):
+        """Fetch the file as parallel byte ranges, each written straight to its offset in filepath"""
+        step = -(-total_size // _RANGE_PARTS)
+        ranges = [(start, min(start + step, total_size) - 1) for start in range(0, total_size, step)]
+        lock = threading.Lock()
+        failed = threading.Event()
+        done = [0] * len(ranges)
+
         with open(filepath, 'wb') as f:
-            for data in response.iter_content(block_size):
-                wrote += len(data)
-                f.write(data)
-                if progress_callback and total_size > 0:
-                    progress_callback(wrote, total_size)
+            _preallocate(f, total_size)
+
+        def fetch(i):
+            start, end = ranges[i]
+            expected = end - start + 1
+            wrote = 0
+            headers = {'Range': f'bytes={start}-{end}'}
+            with self.session.get(url, headers=headers, stream=True, timeout=(10, 60)) as response:
+                if response.status_code != 206:
+                    raise Exception(f"Range request failed: HTTP {response.status_code}")
+                # Own handle per range, so concurrent writers never share a file position
+                with open(filepath, 'r+b') as f:
+                    f.seek(start)
+                    for data in response.iter_content(chunk_size):
+                        if failed.is_set():
+                            raise Exception("Aborted: another range failed")
+                        f.write(data)
+                        wrote += len(data)
+                        with lock:
+                            done[i] = wrote
+                            if progress_callback:
+                                progress_callback(sum(done), total_size)
+            if wrote != expected:
+                raise Exception(f"Incomplete download: got {wrote} of {expected} bytes")
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [pool.submit(fetch, i) for i in range(len(ranges))]
+                finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                errors = [future.exception() for future in finished if future.exception()]
+                if errors:
+                    # Stop the sibling ranges at their next chunk instead of letting them run to the end
+                    failed.set()
+                    wait(futures)
+                    raise errors[0]
+        except BaseException:
+            # The file is already full size; a hole-filled leftover would pass for a finished download
+            _safe_unlink(filepath)
+            raise
+
+    def _download_stream(self, url, filepath, progress_callback=None, chunk_size=_CHUNK_SIZE):
+        response = self.session.get(url, stream=True, timeout=(10, 60))
+        response.raise_for_status()
+        total_size = int(response.headers.get('content-length', 0))
+        wrote = 0
+        # Content-Length is the on-disk size only when the body is not content-encoded
+        exact_size = total_size if 'content-encoding' not in response.headers else 0
+        
+        try:
+            with open(filepath, 'wb') as f:
+                _preallocate(f, exact_size)
+                for data in response.iter_content(chunk_size):
+                    wrote += len(data)
+                    f.write(data)
+                    if progress_callback and total_size > 0:
+                        progress_callback(wrote, total_size)
+            
+            # A dropped connection ends iter_content quietly; don't hand a truncated file to ffmpeg
+            if exact_size and wrote != exact_size:
+                raise Exception(f"Incomplete download: got {wrote} of {exact_size} bytes")
+        except BaseException:
+            # Preallocated or partial output must not be left looking like a finished file
+            _safe_unlink(filepath)
+            raise
+
+    def _ensure_dir(self, path):
+        """makedirs once per directory for the lifetime of the downloader"""
+        if path not in self._dirs_made:
+            os.makedirs(path, exist_ok=True)
+            self._dirs_made.add(path)
+
+    def download_files(self, jobs, progress_callback=None):
+        """
+        Download several (url, filepath) pairs concurrently.
+        Progress is reported over the combined size once every transfer has started.
+        If one transfer fails the others are aborted at their next chunk.
+        """
+        lock = threading.Lock()
+        failed = threading.Event()
+        wrote = [0] * len(jobs)
+        totals = [0] * len(jobs)
+
+        def make_callback(i):
+            def callback(current, total):
+                if failed.is_set():
+                    raise Exception("Aborted: another stream failed")
+                with lock:
+                    wrote[i] = current
+                    totals[i] = total
+                    if progress_callback and all(totals):
+                        progress_callback(sum(wrote), sum(totals))
+            return callback
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(self.download_file, url, path, make_callback(i))
+                       for i, (url, path) in enumerate(jobs)]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            errors = [future.exception() for future in done if future.exception()]
+            if errors:
+                failed.set()
+                wait(futures)
+                raise errors[0]
 
     def get_ffmpeg_path(self):
         """Get the path to the ffmpeg executable."""
@@ -194,13 +524,17 @@ class BiliDownloader:
 
     def merge_video_audio(self, video_path, audio_path, output_path):
         """Merges video and audio using ffmpeg."""
+        import subprocess
         ffmpeg_path = self.get_ffmpeg_path()
         cmd = [
             ffmpeg_path, '-y', # Overwrite output
+            '-loglevel', 'error',
             '-i', video_path,
             '-i', audio_path,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
+            '-map', '0:v:0',
+            '-map', '1:a:0',
+            '-c', 'copy', # DASH audio is already AAC, remux only
+            '-movflags', '+faststart',
             output_path
         ]
         # On Windows, we might need to prevent the console window from popping up
@@ -209,5 +543,8 @@ class BiliDownloader:
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             
-        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, startupinfo=startupinfo)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, startupinfo=startupinfo)
+        if result.returncode != 0:
+            detail = result.stderr.decode(errors='replace').strip().splitlines()
+            raise Exception(detail[-1] if detail else f"ffmpeg exited with code {result.returncode}")
 
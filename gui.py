@@ -1,16 +1,203 @@
 import sys
 import os
+import re
 import threading
+import unicodedata
+import time
+from operator import itemgetter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from io import BytesIO
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLineEdit, QPushButton, QLabel, QProgressBar, QMessageBox, 
                              QDialog, QComboBox, QScrollArea, QFrame, QGraphicsDropShadowEffect,
                              QGraphicsOpacityEffect, QSizePolicy, QTextEdit)
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QSize, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QPoint, QPointF, QRectF
-from PySide6.QtGui import QPixmap, QImage, QIcon, QFont, QColor, QPainter, QPainterPath, QFontMetrics, QTransform, QPolygonF
-
-from core import BiliDownloader
+from PySide6.QtCore import Qt, QThread, QThreadPool, QRunnable, QObject, Signal, Property, QTimer, QSize, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QPoint, QPointF, QRectF
+from PySide6.QtGui import QPixmap, QImage, QIcon, QFont, QColor, QPainter, QFontMetrics, QTransform, QPolygonF
+
+from core import BiliDownloader, _safe_unlink
+
+# Covers and avatars are well under this; anything bigger is not an image we want in memory
+_MAX_IMAGE_BYTES = 4 * 1024 * 1024
+
+# Output filenames keep letters and digits of any script, spaces and hyphens; everything else,
+# underscores included (\w would keep them), is dropped
+_FILENAME_STRIP = re.compile(r'[^\w \-]+|_+')
+
+def _name_key(name):
+    """Comparison key for file names on case-insensitive / normalizing filesystems (NTFS, APFS)"""
+    return unicodedata.normalize("NFC", name).casefold()
+
+# BV IDs anywhere in the input box, whether bare or inside a full video URL
+_BV_RE = re.compile(r'BV[0-9A-Za-z]{10}')
+
+# Play URLs for this many analyzed videos are requested ahead of "Download" (stays under the downloader's play cache size)
+_PLAY_PREFETCH_MAX = 16
+
+# Static stylesheets, built once at import instead of on every apply_styles() call
+_WINDOW_QSS = """
+QMainWindow {
+    background-color: #F5F5F7; /* Apple System Gray 6 (Light) */
+}
+"""
+
+_CONTENT_QSS = """
+/* Refined generic selector to avoid hitting QComboBox/QProgressBar unless targeted */
+QLabel, QLineEdit, QTextEdit, QPushButton {
+    font-family: -apple-system, BlinkMacSystemFont, "SF Pro Text", "Helvetica Neue", sans-serif;
+    color: #1D1D1F;
+}
+
+/* --- Brand Watermark --- */
+QFrame#BrandWatermark {
+    background: rgba(255, 255, 255, 0.6);
+    border: 1px solid rgba(0, 0, 0, 0.05);
+    border-radius: 12px;
+}
+QLabel#BrandText {
+    font-size: 20px; /* Reduced from 24 */
+    font-weight: 700;
+    color: #1D1D1F;
+    letter-spacing: -0.5px;
+}
+
+/* --- User Pill --- */
+QFrame#UserPill {
+    background: rgba(255, 255, 255, 0.6);
+    border-radius: 20px;
+    border: 1px solid rgba(0, 0, 0, 0.05);
+}
+QLabel#UserName {
+    font-size: 13px; /* Reduced from 14 */
+    font-weight: 500;
+    color: #1D1D1F;
+}
+QPushButton#AuthBtn {
+    background-color: transparent;
+    color: #007AFF;
+    font-weight: 600;
+    border: none;
+    font-size: 12px; /* Reduced from 13 */
+}
+QPushButton#AuthBtn:hover {
+    color: #0051A8;
+}
+QPushButton#AuthBtn[authState="logout"] {
+    color: #FF3B30;
+}
+QPushButton#AuthBtn[authState="logout"]:hover {
+    color: #D70015;
+}
+
+/* --- Search Input --- */
+QLineEdit#SearchInput {
+    background-color: #FFFFFF;
+    border: 1px solid #D1D1D6; /* System Gray 4 */
+    border-radius: 12px;
+    color: #1D1D1F;
+    font-size: 14px; /* Reduced from 16 */
+    padding-left: 12px;
+    selection-background-color: #B3D7FF;
+}
+QLineEdit#SearchInput:focus {
+    border: 2px solid #007AFF; /* System Blue */
+    background-color: #FFFFFF;
+}
+
+/* --- Buttons --- */
+QPushButton#PrimaryBtn {
+    background-color: #007AFF;
+    color: #FFFFFF;
+    border-radius: 12px;
+    font-size: 13px; /* Reduced from 14 */
+    font-weight: 600;
+    border: none;
+}
+QPushButton#PrimaryBtn:hover {
+    background-color: #0051A8;
+}
+QPushButton#PrimaryBtn:pressed {
+    background-color: #003E80;
+}
+QPushButton#PrimaryBtn:disabled {
+    background-color: #99C7FF;
+}
+
+QPushButton#DownloadBtn {
+    background-color: #34C759; /* System Green */
+    color: #FFFFFF;
+    border-radius: 20px; /* Slightly reduced radius */
+    font-size: 13px; /* Reduced from 15 */
+    font-weight: 600;
+    border: none;
+}
+QPushButton#DownloadBtn:hover {
+    background-color: #248A3D;
+}
+QPushButton#DownloadBtn:pressed {
+    background-color: #1E7030;
+}
+QPushButton#DownloadBtn:disabled {
+    background-color: #A1E3B1;
+}
+
+/* --- Image Container --- */
+QFrame#ImageContainer {
+    border-radius: 12px; /* Reduced radius */
+    background-color: #FFFFFF;
+    border: 1px solid rgba(0, 0, 0, 0.05);
+}
+QFrame#ImageContainer > QLabel {
+    border-radius: 12px;
+}
+
+/* --- Subtitle Area (Glass Card) --- */
+QFrame#GlassCard {
+    background-color: rgba(255, 255, 255, 0.7); /* Translucent White */
+    border-radius: 24px;
+    border: 1px solid rgba(255, 255, 255, 0.4);
+}
+
+/* --- Typography --- */
+QLabel#VideoTitle {
+    font-size: 22px; /* Reduced from 28 */
+    font-weight: 700;
+    color: #1D1D1F;
+    line-height: 1.2;
+    letter-spacing: -0.5px;
+}
+QLabel#VideoDesc {
+    font-size: 13px; /* Reduced from 15 */
+    color: #86868B; /* System Gray */
+    line-height: 1.4;
+}
+QLabel#StatsText {
+    font-size: 13px;
+    color: #86868B;
+    font-weight: 500;
+}
+QLabel#StatusText {
+    font-size: 12px; /* Reduced from 13 */
+    color: #86868B;
+    font-weight: 500;
+}
+
+/* --- Progress Bar --- */
+QProgressBar {
+    background-color: #E5E5E5;
+    border-radius: 3px;
+    border: none;
+}
+QProgressBar::chunk {
+    background-color: #007AFF;
+    border-radius: 3px;
+}
+"""
+
+# Avatar label looks: empty placeholder, or transparent so the round pixmap has no square corners
+_AVATAR_EMPTY_QSS = "border-radius: 14px; background: #F0F0F0;"
+_AVATAR_IMAGE_QSS = "background: transparent; border: none;"
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -35,12 +222,26 @@ class Toast(QWidget):
         
         self.message = ""
         self.is_success = True
-        self.opacity_effect = QGraphicsOpacityEffect(self)
-        self.setGraphicsEffect(self.opacity_effect)
-        self.opacity_effect.setOpacity(0)
+        # Bold 12pt font and its metrics are fixed; build them once for sizeHint/paintEvent
+        self._toast_font = QFont(self.font())
+        self._toast_font.setPointSize(12)
+        self._toast_font.setBold(True)
+        self._fm = QFontMetrics(self._toast_font)
+        # The toast paints itself entirely, so it fades via painter opacity
+        # instead of a QGraphicsOpacityEffect (which renders through an offscreen buffer)
+        self._opacity = 0.0
         self.animation = None
         self.hide()
 
+    def _get_opacity(self):
+        return self._opacity
+
+    def _set_opacity(self, value):
+        self._opacity = value
+        self.update()
+
+    opacity = Property(float, _get_opacity, _set_opacity)
+
     def show_message(self, text, is_success=True, duration=1000):
         if self.animation:
             self.animation.stop()
@@ -59,10 +260,10 @@ class Toast(QWidget):
         self.show()
         self.raise_()
         
-        self.opacity_effect.setOpacity(0)
-        self.animation = QPropertyAnimation(self.opacity_effect, b"opacity")
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(1)
+        self._opacity = 0.0
+        self.animation = QPropertyAnimation(self, b"opacity")
+        self.animation.setStartValue(0.0)
+        self.animation.setEndValue(1.0)
         self.animation.setDuration(200)
         self.animation.start()
         
@@ -72,9 +273,9 @@ class Toast(QWidget):
         if self.animation:
             self.animation.stop()
             
-        self.animation = QPropertyAnimation(self.opacity_effect, b"opacity")
-        self.animation.setStartValue(self.opacity_effect.opacity())
-        self.animation.setEndValue(0)
+        self.animation = QPropertyAnimation(self, b"opacity")
+        self.animation.setStartValue(self._opacity)
+        self.animation.setEndValue(0.0)
         self.animation.setDuration(200)
         self.animation.finished.connect(self.hide)
         self.animation.start()
@@ -82,6 +283,7 @@ class Toast(QWidget):
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.setOpacity(self._opacity)
         
         rect = self.rect()
         # Green for success, Red for error
@@ -92,41 +294,38 @@ class Toast(QWidget):
         painter.drawRoundedRect(rect, 8, 8)
         
         painter.setPen(Qt.white)
-        font = self.font()
-        font.setPointSize(12)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setFont(self._toast_font)
         painter.drawText(rect, Qt.AlignCenter, self.message)
         
     def sizeHint(self):
-        font = self.font()
-        font.setPointSize(12)
-        font.setBold(True)
-        metrics = QFontMetrics(font)
-        width = metrics.horizontalAdvance(self.message) + 40
+        width = self._fm.horizontalAdvance(self.message) + 40
         return QSize(max(120, width), 40)
 
-class WorkerThread(QThread):
+class _TaskSignals(QObject):
     finished = Signal(object)
     error = Signal(str)
-    
+
+class _Task(QRunnable):
+    """Short-lived background call run on the global QThreadPool (reuses pooled OS threads)"""
     def __init__(self, target, *args):
         super().__init__()
         self.target = target
         self.args = args
+        self.signals = _TaskSignals()
         
     def run(self):
         try:
             result = self.target(*self.args)
-            self.finished.emit(result)
+            self.signals.finished.emit(result)
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
 
 class DownloadWorker(QThread):
     progress = Signal(float)
     status = Signal(str)
     finished = Signal(str)
     error = Signal(str)
+    prefetch_next = Signal() # Emitted once, when the transfer passes 80%
 
     def __init__(self, downloader, url, filepath, is_dash=False, dash_info=None):
         super().__init__()
@@ -135,6 +334,9 @@ class DownloadWorker(QThread):
         self.filepath = filepath
         self.is_dash = is_dash
         self.dash_info = dash_info
+        self._last_emit_t = 0.0
+        self._last_emit_p = -1
+        self._prefetch_sent = False
 
     def run(self):
         try:
@@ -149,21 +351,24 @@ class DownloadWorker(QThread):
                 a_path = self.dash_info['a_path']
                 out_path = self.filepath
 
-                self.status.emit("Downloading Video...")
-                self.downloader.download_file(video_url, v_path, self._progress_callback_factory(0, 50))
-                
-                self.status.emit("Downloading Audio...")
-                self.downloader.download_file(audio_url, a_path, self._progress_callback_factory(50, 95))
-                
-                self.status.emit("Merging...")
                 try:
-                    self.downloader.merge_video_audio(v_path, a_path, out_path)
-                    if os.path.exists(v_path): os.remove(v_path)
-                    if os.path.exists(a_path): os.remove(a_path)
-                    self.progress.emit(100)
-                    self.finished.emit(out_path)
-                except Exception as e:
-                    self.error.emit(f"Merge failed: {str(e)}")
+                    self.status.emit("Downloading Video & Audio...")
+                    self.downloader.download_files(
+                        [(video_url, v_path), (audio_url, a_path)],
+                        self._progress_callback_factory(0, 95)
+                    )
+                    
+                    self.status.emit("Merging...")
+                    try:
+                        self.downloader.merge_video_audio(v_path, a_path, out_path)
+                        self.progress.emit(100)
+                        self.finished.emit(out_path)
+                    except Exception as e:
+                        self.error.emit(f"Merge failed: {str(e)}")
+                finally:
+                    # Never leave the (often hundreds of MB) intermediate streams behind
+                    for path in (v_path, a_path):
+                        _safe_unlink(path)
 
         except Exception as e:
             self.error.emit(str(e))
@@ -171,22 +376,36 @@ class DownloadWorker(QThread):
     def _progress_callback(self, current, total):
         if total > 0:
             p = (current / total) * 100
-            self.progress.emit(p)
-            self.status.emit(f"Downloading... {int(p)}%")
+            self._emit_progress(p)
 
     def _progress_callback_factory(self, start, end):
         def callback(current, total):
             if total > 0:
                 fraction = current / total
                 p = start + (fraction * (end - start))
-                self.progress.emit(p)
-                self.status.emit(f"Downloading... {int(p)}%")
+                self._emit_progress(p)
         return callback
 
+    def _emit_progress(self, p):
+        """Forward progress at most ~30 times a second and only when the whole percentage changes"""
+        now = time.monotonic()
+        if p < 99.9 and (int(p) == self._last_emit_p or now - self._last_emit_t < 1 / 30):
+            return
+        self._last_emit_t = now
+        self._last_emit_p = int(p)
+        if p >= 80 and not self._prefetch_sent:
+            self._prefetch_sent = True
+            self.prefetch_next.emit()
+        self.progress.emit(p)
+        self.status.emit(f"Downloading... {int(p)}%")
+
 class LoginDialog(QDialog):
     def __init__(self, authenticator, parent=None):
         super().__init__(parent)
         self.authenticator = authenticator
+        self._poll_ms = 2000
+        self._cancelled = False
+        self._poll_signals = None
         self.setWindowTitle("Login to Bilibili")
         self.setFixedSize(360, 480)
         self.setup_ui()
@@ -222,36 +441,77 @@ class LoginDialog(QDialog):
         layout.addWidget(self.lbl_status)
 
     def start_login_process(self):
-        try:
-            self.qr_url = self.authenticator.get_login_qrcode()
-            img_data = self.authenticator.get_qrcode_image(self.qr_url)
-            
-            pixmap = QPixmap()
-            pixmap.loadFromData(img_data)
-            self.lbl_qr.setPixmap(pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.poll_status)
-            self.timer.start(2000)
-            
-        except Exception as e:
-            self.lbl_status.setText(f"Error: {e}")
+        # Single-shot timer re-armed after every poll so the interval can adapt to the login state
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.poll_status)
+        
+        # Fetch and render the QR code on the pool so the dialog shows immediately
+        task = _Task(self._fetch_qrcode)
+        self._qr_signals = task.signals
+        task.signals.finished.connect(self.on_qrcode_ready, Qt.QueuedConnection)
+        task.signals.error.connect(self.on_qrcode_error, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+
+    def _fetch_qrcode(self):
+        """Request a login QR code and decode it at display size (QImage is safe off the GUI thread)"""
+        url = self.authenticator.get_login_qrcode()
+        image = QImage()
+        # Always PNG (see BiliAuthenticator._render_qrcode); nearest-neighbour keeps module edges crisp
+        image.loadFromData(self.authenticator.get_qrcode_image(url), "PNG")
+        return url, image.scaled(180, 180, Qt.KeepAspectRatio, Qt.FastTransformation)
+
+    def on_qrcode_ready(self, result):
+        if self._cancelled:
+            return
+        self.qr_url, image = result
+        self.lbl_qr.setPixmap(QPixmap.fromImage(image))
+        self.timer.start(self._poll_ms)
+
+    def on_qrcode_error(self, err_msg):
+        self.lbl_status.setText(f"Error: {err_msg}")
+
+    def done(self, result):
+        self._cancelled = True
+        super().done(result)
 
     def poll_status(self):
-        try:
-            code, msg = self.authenticator.poll_login_status()
-            if code == 0:
-                self.lbl_status.setText("Success!")
-                self.timer.stop()
-                self.accept()
-            elif code == 86101:
-                self.lbl_status.setText("Waiting for scan...")
-            elif code == 86090:
-                self.lbl_status.setText("Scanned, please confirm")
-            else:
-                self.lbl_status.setText(msg)
-        except Exception as e:
-            print(e)
+        if self._cancelled or not self.isVisible():
+            return
+        # The request runs on the thread pool; the next poll is only scheduled once it has answered
+        task = _Task(self.authenticator.poll_login_status)
+        self._poll_signals = task.signals
+        task.signals.finished.connect(self.on_poll_result, Qt.QueuedConnection)
+        task.signals.error.connect(self.on_poll_error, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+
+    def on_poll_result(self, result):
+        if self._cancelled:
+            return
+        code, msg = result
+        if code == 0:
+            self.lbl_status.setText("Success!")
+            self.accept()
+            return
+        elif code == 86101:
+            # Nobody has scanned yet: back off gradually
+            self.lbl_status.setText("Waiting for scan...")
+            self._poll_ms = min(5000, int(self._poll_ms * 1.3))
+        elif code == 86090:
+            # Scanned: confirmation usually follows within seconds
+            self.lbl_status.setText("Scanned, please confirm")
+            self._poll_ms = 500
+        elif code == 86038:
+            self.lbl_status.setText(msg)
+            return
+        else:
+            self.lbl_status.setText(msg)
+        self.timer.start(self._poll_ms)
+
+    def on_poll_error(self, err_msg):
+        print(err_msg)
+        if not self._cancelled:
+            self.timer.start(self._poll_ms)
 
 class GlassCard(QFrame):
     def __init__(self, parent=None):
@@ -298,27 +558,61 @@ class SearchInput(QTextEdit):
              pass
 
 class TrapezoidImageList(QWidget):
+    CARD_W = 280
+    CARD_H = 158 # 16:9 approx
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.images = [] # List of QPixmap
+        self.images = [] # List of pre-warped card QImages
+        self._offsets = [] # Card x positions, valid for _cached_w
+        self._cached_w = None
+        self._quad = self._card_quad() # Target trapezoid, shared by every card
+        # Coalesce bursts of set_images() into at most one repaint per frame
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(16)
+        self._update_timer.timeout.connect(self.update)
         self.setFixedHeight(220) # Height to accommodate cards
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
-    def set_images(self, pixmaps):
-        self.images = pixmaps
-        self.update()
+    def set_images(self, images):
+        # The trapezoid warp does not depend on the card's position, so each cover is
+        # resampled once here and paintEvent only blits the finished cards
+        dpr = self.devicePixelRatioF()
+        self.images = [self._render_card(image, dpr) for image in images]
+        self._cached_w = None
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _render_card(self, image, dpr):
+        """Warp image onto the trapezoid card shape, at device resolution"""
+        card_w = self.CARD_W
+        card_h = self.CARD_H
+        
+        card = QImage(round(card_w * dpr), round(card_h * dpr), QImage.Format_ARGB32_Premultiplied)
+        card.setDevicePixelRatio(dpr)
+        card.fill(Qt.transparent)
+        
+        transform = QTransform()
+        if QTransform.quadToQuad(QPolygonF(QRectF(image.rect())), self._quad, transform):
+            painter = QPainter(card)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.setTransform(transform)
+            painter.drawImage(image.rect(), image)
+            painter.end()
+        return card
 
-    def paintEvent(self, event):
-        if not self.images:
-            return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        
-        # Card settings
-        card_w = 280 
-        card_h = 158 # 16:9 approx
+    def _card_quad(self):
+        """Target Quad (Trapezoid): left side full height, right side 0.8 of it"""
+        card_w = self.CARD_W
+        card_h = self.CARD_H
+        diff = (card_h - card_h * 0.8) / 2
+        return QPolygonF([QPointF(0, 0), QPointF(card_w, diff), QPointF(card_w, card_h - diff), QPointF(0, card_h)])
+
+    def _layout_offsets(self):
+        """x position of every card; only depends on width and image count"""
+        card_w = self.CARD_W
         
         # Calculate dynamic overlap/spacing
         # We have available width: self.width()
@@ -353,37 +647,20 @@ class TrapezoidImageList(QWidget):
                 if step_x < min_step:
                     step_x = min_step
 
-        start_y = 20
-        current_x = start_x
+        return [start_x + i * step_x for i in range(n)]
+
+    def paintEvent(self, event):
+        if not self.images:
+            return
         
-        for i, pixmap in enumerate(self.images):
-            # Source Rect
-            src_rect = QRectF(pixmap.rect())
-            
-            # Target Quad (Trapezoid)
-            # Left side: normal height
-            # Right side: reduced height (0.8)
-            h_left = card_h
-            h_right = card_h * 0.8
-            diff = (h_left - h_right) / 2
+        if self._cached_w != self.width():
+            self._offsets = self._layout_offsets()
+            self._cached_w = self.width()
             
-            tl = QPointF(current_x, start_y)
-            tr = QPointF(current_x + card_w, start_y + diff)
-            br = QPointF(current_x + card_w, start_y + card_h - diff)
-            bl = QPointF(current_x, start_y + card_h)
-            
-            quad = QPolygonF([tl, tr, br, bl])
-            
-            # Create Transform
-            transform = QTransform()
-            if QTransform.quadToQuad(QPolygonF(src_rect), quad, transform):
-                painter.save()
-                painter.setTransform(transform)
-                painter.drawPixmap(pixmap.rect(), pixmap)
-                painter.restore()
-            
-            # Advance
-            current_x += step_x
+        painter = QPainter(self)
+        start_y = 20
+        for card, x in zip(self.images, self._offsets):
+            painter.drawImage(QPointF(x, start_y), card)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -395,18 +672,36 @@ class MainWindow(QMainWindow):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
             
-        self.downloader = BiliDownloader()
-        self.video_queue = [] # List of URLs to process
-        self.current_download_index = 0
+        self.downloader = None # Created by _finish_init once the window has painted
+        self.video_queue = deque() # BV IDs still to download, consumed from the left
+        self.current_info_map = {} # BV ID -> video info already fetched
+        self.current_bvid = None # BV ID being downloaded
         self.is_downloading = False
         self.is_logged_in = False
+        self._analyze_in_flight = False
+        self._pending_download = None # (info, target_qn) of the play URL request in flight
+        self._pending_tasks = set() # Keeps task signal objects alive until their result is delivered
+        
+        # Circular avatar clip is constant; the rendered avatar is reused while the face URL is unchanged
+        self._avatar_mask = self._circle_mask(28)
+        self._avatar_url = None
+        self._avatar_pixmap = None
         
         self.setup_ui()
         self.apply_styles()
         
-        self.check_login_status()
-        
         self.toast = Toast(self)
+        
+        # Session setup and cookie loading wait until the event loop runs, so the first frame isn't held up
+        self.btn_analyze.setEnabled(False)
+        self.btn_action.setEnabled(False)
+        QTimer.singleShot(0, self._finish_init)
+
+    def _finish_init(self):
+        self.downloader = BiliDownloader()
+        self.btn_analyze.setEnabled(True)
+        self.btn_action.setEnabled(True)
+        self.check_login_status()
 
     def show_toast(self, message, is_success=True):
         self.toast.show_message(message, is_success)
@@ -509,10 +804,9 @@ class MainWindow(QMainWindow):
         self.content_area = QWidget()
         self.content_area.setVisible(False)
         
-        # Initialize opacity for animation
-        self.content_opacity = QGraphicsOpacityEffect(self.content_area)
-        self.content_opacity.setOpacity(0)
-        self.content_area.setGraphicsEffect(self.content_opacity)
+        # Opacity effect is installed by animate_content_entry only while the fade runs
+        self.content_opacity = None
+        self.anim_opacity = None
         
         # Vertical Layout
         inner_content_layout = QVBoxLayout(self.content_area)
@@ -571,164 +865,23 @@ class MainWindow(QMainWindow):
 
     def apply_styles(self):
         # Apply Main Window background color to self (the QMainWindow)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #F5F5F7; /* Apple System Gray 6 (Light) */
-            }
-        """)
+        self.setStyleSheet(_WINDOW_QSS)
 
         # Apply specific widget styles ONLY to central widget contents.
         # This ensures that child windows (like LoginDialog or QMessageBox) do not inherit these styles,
         # keeping them fully native/system standard.
         if hasattr(self, 'centralWidget') and self.centralWidget():
-            self.centralWidget().setStyleSheet("""
-            /* Refined generic selector to avoid hitting QComboBox/QProgressBar unless targeted */
-            QLabel, QLineEdit, QTextEdit, QPushButton {
-                font-family: -apple-system, BlinkMacSystemFont, "SF Pro Text", "Helvetica Neue", sans-serif;
-                color: #1D1D1F;
-            }
-            
-            /* --- Brand Watermark --- */
-            QFrame#BrandWatermark {
-                background: rgba(255, 255, 255, 0.6);
-                border: 1px solid rgba(0, 0, 0, 0.05);
-                border-radius: 12px;
-            }
-            QLabel#BrandText {
-                font-size: 20px; /* Reduced from 24 */
-                font-weight: 700;
-                color: #1D1D1F;
-                letter-spacing: -0.5px;
-            }
-            
-            /* --- User Pill --- */
-            QFrame#UserPill {
-                background: rgba(255, 255, 255, 0.6);
-                border-radius: 20px;
-                border: 1px solid rgba(0, 0, 0, 0.05);
-            }
-            QLabel#UserName {
-                font-size: 13px; /* Reduced from 14 */
-                font-weight: 500;
-                color: #1D1D1F;
-            }
-            QPushButton#AuthBtn {
-                background-color: transparent;
-                color: #007AFF;
-                font-weight: 600;
-                border: none;
-                font-size: 12px; /* Reduced from 13 */
-            }
-            QPushButton#AuthBtn:hover {
-                color: #0051A8;
-            }
-
-            /* --- Search Input --- */
-            QLineEdit#SearchInput {
-                background-color: #FFFFFF;
-                border: 1px solid #D1D1D6; /* System Gray 4 */
-                border-radius: 12px;
-                color: #1D1D1F;
-                font-size: 14px; /* Reduced from 16 */
-                padding-left: 12px;
-                selection-background-color: #B3D7FF;
-            }
-            QLineEdit#SearchInput:focus {
-                border: 2px solid #007AFF; /* System Blue */
-                background-color: #FFFFFF;
-            }
-
-            /* --- Buttons --- */
-            QPushButton#PrimaryBtn {
-                background-color: #007AFF;
-                color: #FFFFFF;
-                border-radius: 12px;
-                font-size: 13px; /* Reduced from 14 */
-                font-weight: 600;
-                border: none;
-            }
-            QPushButton#PrimaryBtn:hover {
-                background-color: #0051A8;
-            }
-            QPushButton#PrimaryBtn:pressed {
-                background-color: #003E80;
-            }
-            QPushButton#PrimaryBtn:disabled {
-                background-color: #99C7FF;
-            }
-
-            QPushButton#DownloadBtn {
-                background-color: #34C759; /* System Green */
-                color: #FFFFFF;
-                border-radius: 20px; /* Slightly reduced radius */
-                font-size: 13px; /* Reduced from 15 */
-                font-weight: 600;
-                border: none;
-            }
-            QPushButton#DownloadBtn:hover {
-                background-color: #248A3D;
-            }
-            QPushButton#DownloadBtn:pressed {
-                background-color: #1E7030;
-            }
-            QPushButton#DownloadBtn:disabled {
-                background-color: #A1E3B1;
-            }
-
-            /* --- Image Container --- */
-            QFrame#ImageContainer {
-                border-radius: 12px; /* Reduced radius */
-                background-color: #FFFFFF;
-                border: 1px solid rgba(0, 0, 0, 0.05);
-            }
-            QFrame#ImageContainer > QLabel {
-                border-radius: 12px;
-            }
-
-            /* --- Subtitle Area (Glass Card) --- */
-            QFrame#GlassCard {
-                background-color: rgba(255, 255, 255, 0.7); /* Translucent White */
-                border-radius: 24px;
-                border: 1px solid rgba(255, 255, 255, 0.4);
-            }
-
-            /* --- Typography --- */
-            QLabel#VideoTitle {
-                font-size: 22px; /* Reduced from 28 */
-                font-weight: 700;
-                color: #1D1D1F;
-                line-height: 1.2;
-                letter-spacing: -0.5px;
-            }
-            QLabel#VideoDesc {
-                font-size: 13px; /* Reduced from 15 */
-                color: #86868B; /* System Gray */
-                line-height: 1.4;
-            }
-            QLabel#StatsText {
-                font-size: 13px;
-                color: #86868B;
-                font-weight: 500;
-            }
-            QLabel#StatusText {
-                font-size: 12px; /* Reduced from 13 */
-                color: #86868B;
-                font-weight: 500;
-            }
-
-            /* --- Progress Bar --- */
-            QProgressBar {
-                background-color: #E5E5E5;
-                border-radius: 3px;
-                border: none;
-            }
-            QProgressBar::chunk {
-                background-color: #007AFF;
-                border-radius: 3px;
-            }
-        """)
+            self.centralWidget().setStyleSheet(_CONTENT_QSS)
 
     def animate_content_entry(self):
+        if self.anim_opacity:
+            self.anim_opacity.stop()
+        
+        # QGraphicsOpacityEffect renders the whole subtree offscreen on every paint,
+        # so it only lives for the duration of the fade and is removed when it finishes
+        self.content_opacity = QGraphicsOpacityEffect(self.content_area)
+        self.content_opacity.setOpacity(0)
+        self.content_area.setGraphicsEffect(self.content_opacity)
         self.content_area.setVisible(True)
         
         # Opacity Animation
@@ -744,24 +897,37 @@ class MainWindow(QMainWindow):
         # Alternatively, we can animate the maximumHeight, but that changes layout size. 
         # A pure fade is very "Apple".
         
+        self.anim_opacity.finished.connect(lambda: self.content_area.setGraphicsEffect(None))
         self.anim_opacity.start()
 
     def handle_auth(self):
+        if self.downloader is None:
+            return
         if self.is_logged_in:
-            if self.show_simple_confirm("Logout", "Are you sure you want to logout?"):
-                self.downloader.logout()
-                self.check_login_status()
+            self.show_simple_confirm("Logout", "Are you sure you want to logout?", self.on_logout_confirmed)
         else:
             dialog = LoginDialog(self.downloader.authenticator, self)
             if dialog.exec() == QDialog.Accepted:
                 self.downloader.save_cookies()
+                self.downloader.clear_cache()
                 self.check_login_status()
                 self.show_toast("Login successful!", is_success=True)
 
+    def _submit(self, fn, *args, on_finished=None, on_error=None):
+        """Run fn(*args) on the shared thread pool; callbacks are delivered on the GUI thread"""
+        task = _Task(fn, *args)
+        signals = task.signals
+        self._pending_tasks.add(signals)
+        if on_finished:
+            signals.finished.connect(on_finished, Qt.QueuedConnection)
+        if on_error:
+            signals.error.connect(on_error, Qt.QueuedConnection)
+        signals.finished.connect(lambda _: self._pending_tasks.discard(signals), Qt.QueuedConnection)
+        signals.error.connect(lambda _: self._pending_tasks.discard(signals), Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+
     def check_login_status(self):
-        self.login_worker = WorkerThread(self.downloader.get_user_info)
-        self.login_worker.finished.connect(self.on_login_check_finished)
-        self.login_worker.start()
+        self._submit(self.downloader.get_user_info, on_finished=self.on_login_check_finished)
 
     def show_simple_alert(self, title, message):
         """Shows a minimal native-like alert without icons."""
@@ -775,8 +941,9 @@ class MainWindow(QMainWindow):
         msg_box.setStyleSheet("")
         msg_box.exec()
 
-    def show_simple_confirm(self, title, message):
-        """Shows a minimal native-like confirmation without icons."""
+    def show_simple_confirm(self, title, message, on_yes):
+        """Shows a minimal native-like confirmation without icons; calls on_yes if confirmed.
+        Window-modal open() instead of exec(), so no nested event loop runs while workers report back."""
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle(title)
         msg_box.setText(message)
@@ -784,136 +951,172 @@ class MainWindow(QMainWindow):
         msg_box.setDefaultButton(QMessageBox.No)
         msg_box.setIcon(QMessageBox.NoIcon)
         msg_box.setStyleSheet("")
-        return msg_box.exec() == QMessageBox.Yes
+        msg_box.setAttribute(Qt.WA_DeleteOnClose)
+        msg_box.finished.connect(
+            lambda _: on_yes() if msg_box.standardButton(msg_box.clickedButton()) == QMessageBox.Yes else None)
+        msg_box.open()
+
+    def on_logout_confirmed(self):
+        self.downloader.logout()
+        self.check_login_status()
 
     def on_login_check_finished(self, user_info):
         if user_info:
             self.is_logged_in = True
             self.btn_action.setText("LOGOUT")
-            self.btn_action.setStyleSheet("QPushButton#AuthBtn { color: #FF3B30; }")
+            self._set_auth_state("logout")
             self.lbl_username.setText(user_info['uname'])
-            self.avatar_worker = WorkerThread(self.load_image, user_info['face'])
-            self.avatar_worker.finished.connect(self.on_avatar_loaded)
-            self.avatar_worker.start()
+            if user_info['face'] == self._avatar_url and self._avatar_pixmap:
+                self.lbl_avatar.setPixmap(self._avatar_pixmap)
+                self._set_avatar_style(_AVATAR_IMAGE_QSS)
+            else:
+                self._avatar_url = user_info['face']
+                self._avatar_pixmap = None
+                self._submit(self.load_scaled_image, user_info['face'], 28, 28, on_finished=self.on_avatar_loaded)
         else:
             self.is_logged_in = False
             self.btn_action.setText("Login")
-            self.btn_action.setStyleSheet("QPushButton#AuthBtn { color: #007AFF; }")
+            self._set_auth_state("login")
             self.lbl_username.setText("Guest")
-            self.lbl_avatar.setStyleSheet("border-radius: 14px; background: #F0F0F0;")
+            self._set_avatar_style(_AVATAR_EMPTY_QSS)
             self.lbl_avatar.clear()
 
+    def _set_avatar_style(self, qss):
+        """Only hand Qt a stylesheet (and a repolish) when the avatar look actually changes"""
+        if self.lbl_avatar.styleSheet() != qss:
+            self.lbl_avatar.setStyleSheet(qss)
+
+    def _set_auth_state(self, state):
+        """Switch the auth button colour via a dynamic property matched in _CONTENT_QSS (no stylesheet reparse)"""
+        if self.btn_action.property("authState") != state:
+            self.btn_action.setProperty("authState", state)
+            self.btn_action.style().unpolish(self.btn_action)
+            self.btn_action.style().polish(self.btn_action)
+
     def load_image(self, url):
+        """Image bytes for url, or None on network errors, bad status or oversized bodies"""
         try:
-            resp = requests.get(url)
-            return resp.content
-        except:
+            # Same pooled keep-alive session as the API and downloads
+            with self.downloader.session.get(url, timeout=(3, 10), stream=True) as resp:
+                resp.raise_for_status()
+                buf = bytearray()
+                for chunk in resp.iter_content(65536):
+                    buf.extend(chunk)
+                    if len(buf) > _MAX_IMAGE_BYTES:
+                        print(f"Image too large, skipped: {url}")
+                        return None
+                return bytes(buf)
+        except requests.RequestException as e:
+            print(f"Failed to load image {url}: {e}")
+            return None
+
+    def load_scaled_image(self, url, width, height, mode=Qt.KeepAspectRatioByExpanding):
+        """Download and decode url into a QImage scaled to width x height (QImage, unlike QPixmap, is safe off the GUI thread)"""
+        data = self.load_image(url)
+        image = QImage()
+        if not data or not image.loadFromData(data):
             return None
+        return image.scaled(width, height, mode, Qt.SmoothTransformation)
+
+    @staticmethod
+    def _circle_mask(size):
+        """Antialiased opaque disc, used to cut avatars round with one alpha blend"""
+        mask = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        mask.fill(Qt.transparent)
+        painter = QPainter(mask)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(Qt.white)
+        painter.drawEllipse(0, 0, size, size)
+        painter.end()
+        return mask
 
-    def on_avatar_loaded(self, data):
-        if data:
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
+    def on_avatar_loaded(self, image):
+        if image is not None:
             size = 28
-            rounded = QPixmap(size, size)
-            rounded.fill(Qt.transparent)
-            
-            painter = QPainter(rounded)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            canvas = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+            canvas.fill(Qt.transparent)
             
-            path = QPainterPath()
-            path.addEllipse(0, 0, size, size)
-            painter.setClipPath(path)
-            
-            # Use KeepAspectRatioByExpanding to fill the circle
-            scaled = pixmap.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            
-            # Draw centered
-            x = (size - scaled.width()) // 2
-            y = (size - scaled.height()) // 2
-            painter.drawPixmap(x, y, scaled)
+            painter = QPainter(canvas)
+            # Already decoded and scaled (KeepAspectRatioByExpanding fills the circle) in the worker; draw centered
+            x = (size - image.width()) // 2
+            y = (size - image.height()) // 2
+            painter.drawImage(x, y, image)
+            # Keep only the pixels under the disc instead of rasterizing a clip path
+            painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+            painter.drawImage(0, 0, self._avatar_mask)
             painter.end()
             
+            rounded = QPixmap.fromImage(canvas)
+            self._avatar_pixmap = rounded
             self.lbl_avatar.setPixmap(rounded)
-            # Remove border/background style when image is present to avoid square corners showing
-            self.lbl_avatar.setStyleSheet("background: transparent; border: none;")
+            self._set_avatar_style(_AVATAR_IMAGE_QSS)
 
     def analyze_video(self):
+        if self._analyze_in_flight or self.downloader is None:
+            return
         text = self.entry_url.toPlainText().strip()
         if not text:
             self.show_toast("Please enter a URL", is_success=False)
             return
             
-        # Parse lines
-        raw_lines = [line.strip() for line in text.splitlines() if line.strip()]
-        if not raw_lines:
+        # One scan over the whole buffer; BV IDs are the dedup key (e.g. BV123... and BV123.../ are same)
+        raw_ids = _BV_RE.findall(text)
+        if not raw_ids:
+            self.show_toast("No BV ID found", is_success=False)
             return
 
         # Deduplicate while preserving order
-        unique_lines = []
-        seen_keys = set()
-        
-        for line in raw_lines:
-            # Try to extract ID for smarter deduplication (e.g. BV123... and BV123.../ are same)
-            key = self.downloader._extract_bvid(line)
-            if not key:
-                key = line # Fallback to raw string if no BVID found
-            
-            if key not in seen_keys:
-                unique_lines.append(line)
-                seen_keys.add(key)
+        unique_ids = list(dict.fromkeys(raw_ids))
         
         # Stats
-        self.stats_total_input = len(raw_lines)
-        self.stats_duplicates = len(raw_lines) - len(unique_lines)
+        self.stats_total_input = len(raw_ids)
+        self.stats_duplicates = len(raw_ids) - len(unique_ids)
         
-        self.lbl_stats.setText(f"Analyzing {len(unique_lines)} URLs... (Input: {self.stats_total_input}, Duplicates: {self.stats_duplicates})")
+        self.lbl_stats.setText(f"Analyzing {len(unique_ids)} URLs... (Input: {self.stats_total_input}, Duplicates: {self.stats_duplicates})")
 
-        self.video_queue = unique_lines
+        self.video_queue = deque(unique_ids)
         self.current_info_map = {} # Reset
         
+        self._analyze_in_flight = True
         self.btn_analyze.setEnabled(False)
         self.btn_analyze.setText("Analyzing...")
         
         # Batch fetch all info
-        self.worker = WorkerThread(self.fetch_batch_info, unique_lines)
-        self.worker.finished.connect(self.on_batch_info_received)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        self._submit(self.fetch_batch_info, unique_ids,
+                     on_finished=self.on_batch_info_received, on_error=self.on_error)
 
     def fetch_batch_info(self, urls):
-        results = []
-        for url in urls:
+        def fetch(url):
             try:
-                info = self.downloader.get_video_info(url)
-                results.append(info)
+                return self.downloader.get_video_info(url)
             except Exception as e:
                 print(f"Error fetching {url}: {e}")
-                results.append(None)
-        return results
+                return None
+        
+        # Up to 8 lookups in flight over the downloader's keep-alive pool; map() keeps input order.
+        # Safe to share: the downloader's caches are locked and disk cache writes go through per-thread temp files
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+            return list(pool.map(fetch, urls))
 
     def on_batch_info_received(self, results):
+        self._analyze_in_flight = False
         valid_infos = []
-        for i, info in enumerate(results):
+        for info in results:
             if info:
-                self.current_info_map[i] = info
+                self.current_info_map[info['bvid']] = info
                 valid_infos.append(info)
         
         # Update Stats
         success_count = len(valid_infos)
         failed_count = len(results) - success_count
-        self.lbl_stats.setText(f"Total: {self.stats_total_input} | Success: {success_count} | Failed: {failed_count} | Duplicates: {self.stats_duplicates}")
+        stats = f"Total: {self.stats_total_input} | Success: {success_count} | Failed: {failed_count} | Duplicates: {self.stats_duplicates}"
 
         if not valid_infos:
+            self.lbl_stats.setText(stats)
             self.on_error("Failed to fetch info for all videos")
             return
 
-        self.btn_analyze.setEnabled(True)
-        self.btn_analyze.setText("Analyze")
-        
-        self.animate_content_entry()
-        
         # Update UI with first valid info
         first_info = valid_infos[0]
         title = first_info['title']
@@ -926,41 +1129,65 @@ class MainWindow(QMainWindow):
         if len(title) > max_len:
             title = title[:max_len] + "..."
 
-        # Set title (elide handled by layout/size policy)
-        self.lbl_video_title.setText(title)
-        self.lbl_video_title.setToolTip(first_info['title'])
+        # Apply all widget changes with painting suspended, so they land in one repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self.lbl_stats.setText(stats)
+            self.btn_analyze.setEnabled(True)
+            self.btn_analyze.setText("Analyze")
+            
+            # Set title (elide handled by layout/size policy)
+            self.lbl_video_title.setText(title)
+            self.lbl_video_title.setToolTip(first_info['title'])
+            
+            if count > 1:
+                self.btn_download.setText(f"Download All ({count})")
+            else:
+                self.btn_download.setText("Download")
+        finally:
+            self.setUpdatesEnabled(True)
         
-        if count > 1:
-            self.btn_download.setText(f"Download All ({count})")
-        else:
-            self.btn_download.setText("Download")
+        self.animate_content_entry()
             
         # Start fetching images
         img_urls = [info['pic'] for info in valid_infos]
-        self.thumb_worker = WorkerThread(self.fetch_batch_images, img_urls)
-        self.thumb_worker.finished.connect(self.on_batch_images_loaded)
-        self.thumb_worker.start()
+        self._submit(self.fetch_batch_images, img_urls, on_finished=self.on_batch_images_loaded)
+        # Warm the downloader's play URL cache so "Download" does not pay that round trip per video
+        self._submit(self.prefetch_play_urls, valid_infos[:_PLAY_PREFETCH_MAX])
 
-    def fetch_batch_images(self, urls):
-        pixmaps = []
-        for url in urls:
+    def prefetch_play_urls(self, infos):
+        # Same qn as process_download_for_info, so the later lookup hits the cache
+        def fetch(info):
             try:
-                content = requests.get(url).content
-                pixmap = QPixmap()
-                if pixmap.loadFromData(content):
-                    pixmaps.append(pixmap)
-            except:
-                pass
-        return pixmaps
+                self.downloader.get_play_url(info['bvid'], info['cid'], 127)
+            except Exception as e:
+                print(f"Error prefetching play URL for {info['bvid']}: {e}")
+        
+        with ThreadPoolExecutor(max_workers=min(4, len(infos))) as pool:
+            list(pool.map(fetch, infos))
 
-    def on_batch_images_loaded(self, pixmaps):
-        self.image_list.set_images(pixmaps)
+    def fetch_batch_images(self, urls):
+        # Covers are stretched onto the card anyway; keep 2x the card size so HiDPI screens stay sharp
+        w, h = TrapezoidImageList.CARD_W * 2, TrapezoidImageList.CARD_H * 2
+        if not urls:
+            return []
+        
+        def fetch(url):
+            return self.load_scaled_image(url, w, h, Qt.IgnoreAspectRatio)
+        
+        # Same pool shape as fetch_batch_info; map() keeps the covers in card order
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+            return [image for image in pool.map(fetch, urls) if image is not None]
+
+    def on_batch_images_loaded(self, images):
+        self.image_list.set_images(images)
 
     def on_capabilities_received(self, play_info):
         # Deprecated logic as combo box is fixed now
         pass
 
     def on_error(self, err_msg):
+        self._analyze_in_flight = False
         self.btn_analyze.setEnabled(True)
         self.btn_analyze.setText("Analyze")
         self.btn_download.setEnabled(True)
@@ -974,39 +1201,37 @@ class MainWindow(QMainWindow):
         self.btn_download.setEnabled(False)
         self.btn_download.setText("Initializing...")
         
-        self.current_download_index = 0
         self.is_downloading = True
         
         self.process_next_download()
 
     def process_next_download(self):
-        if self.current_download_index >= len(self.video_queue):
+        if not self.video_queue:
             self.is_downloading = False
             self.btn_download.setEnabled(True)
             self.btn_download.setText("Download")
             self.show_toast("All downloads completed!", is_success=True)
             # Clear input and reset state
             self.entry_url.clear()
-            self.video_queue = []
             self.current_info_map = {}
             # Reset UI to initial state if desired, or just keep last preview.
             # Keeping preview is fine, but clearing input implies reset.
             return
             
-        url = self.video_queue[self.current_download_index]
+        bvid = self.video_queue.popleft()
+        self.current_bvid = bvid
         
-        # We need to get info first if we don't have it (we only have it for the first one usually)
-        if self.current_download_index in self.current_info_map:
-            self.process_download_for_info(self.current_info_map[self.current_download_index])
+        # Info is usually there from analyze (or the prefetch); only entries that failed back then need a fetch
+        info = self.current_info_map.get(bvid)
+        if info:
+            self.process_download_for_info(info)
         else:
             # Fetch info
-            self.info_worker = WorkerThread(self.downloader.get_video_info, url)
-            self.info_worker.finished.connect(self.on_download_info_received)
-            self.info_worker.error.connect(self.on_download_error)
-            self.info_worker.start()
+            self._submit(self.downloader.get_video_info, bvid,
+                         on_finished=self.on_download_info_received, on_error=self.on_download_error)
 
     def on_download_info_received(self, info):
-        self.current_info_map[self.current_download_index] = info
+        self.current_info_map[info['bvid']] = info
         self.process_download_for_info(info)
 
     def process_download_for_info(self, info):
@@ -1015,31 +1240,45 @@ class MainWindow(QMainWindow):
         
         # We request highest possible quality metadata to check what's available
         # 127 is 8K, asking for it usually returns all available DASH formats
-        self.play_worker = WorkerThread(self.downloader.get_play_url, info['bvid'], info['cid'], 127)
-        self.play_worker.finished.connect(lambda play_info: self.on_play_url_received(play_info, info, target_qn))
-        self.play_worker.error.connect(self.on_download_error)
-        self.play_worker.start()
+        # Downloads run one at a time, so the request context can live on the window instead of a closure
+        self._pending_download = (info, target_qn)
+        self._submit(self.downloader.get_play_url, info['bvid'], info['cid'], 127,
+                     on_finished=self.on_play_url_received, on_error=self.on_download_error)
 
     def on_download_error(self, err_msg):
-        print(f"Error downloading {self.current_download_index}: {err_msg}")
+        print(f"Error downloading {self.current_bvid}: {err_msg}")
+        if self._pending_download:
+            # Expired or rejected stream URLs must not be served from the cache on a retry
+            info = self._pending_download[0]
+            self.downloader.invalidate_play_url(info['bvid'], info['cid'])
+            self._pending_download = None
         # Skip to next
-        self.current_download_index += 1
         self.process_next_download()
 
-    def on_play_url_received(self, play_info, info, target_qn):
+    def on_play_url_received(self, play_info):
+        info, target_qn = self._pending_download
         title = info['title']
-        filename = "".join([c for c in title if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+        filename = _FILENAME_STRIP.sub('', title).rstrip()
         if not filename: filename = info['bvid']
         
         downloads_dir = os.path.expanduser("~/Downloads")
         if not os.path.exists(downloads_dir):
             os.makedirs(downloads_dir)
         
+        # One directory listing instead of a stat() per candidate name; names are compared
+        # case- and normalization-insensitively so "Title.mp4" never overwrites "title.mp4"
+        with os.scandir(downloads_dir) as it:
+            existing = {_name_key(entry.name) for entry in it}
+        
         base_filename = filename
         counter = 1
-        while os.path.exists(os.path.join(downloads_dir, f"{filename}.mp4")):
+        while _name_key(f"{filename}.mp4") in existing:
             filename = f"{base_filename}({counter})"
             counter += 1
+        
+        # Every output/temp path shares this prefix
+        base = os.path.join(downloads_dir, filename)
+        filepath = base + ".mp4"
             
         is_dash = False
         dash_info = None
@@ -1047,41 +1286,30 @@ class MainWindow(QMainWindow):
         
         if 'dash' in play_info:
             is_dash = True
+            # Single pass over the streams; play_info is cached, so it must not be mutated (no in-place sort)
             video_streams = play_info['dash']['video']
-            # Sort by ID descending (Highest quality first)
-            video_streams.sort(key=lambda x: x['id'], reverse=True)
-            
-            selected_video = None
+            by_id = itemgetter('id')
             
             if target_qn == 999: # Highest
-                selected_video = video_streams[0]
+                selected_video = max(video_streams, key=by_id)
             else:
-                # Find exact match or fallback to lower
-                for stream in video_streams:
-                    if stream['id'] <= target_qn:
-                        selected_video = stream
-                        break
-                
-                # If nothing found (e.g. target is lower than lowest available? unlikely but possible), pick lowest
-                if not selected_video:
-                    selected_video = video_streams[-1]
+                # Best stream not above the requested quality; if the target is below everything available, pick lowest
+                selected_video = max((x for x in video_streams if x['id'] <= target_qn),
+                                     key=by_id,
+                                     default=None) or min(video_streams, key=by_id)
 
             video_url = selected_video['base_url']
-            audio_streams = play_info['dash']['audio']
-            audio_streams.sort(key=lambda x: x['id'], reverse=True)
-            audio_url = audio_streams[0]['base_url']
+            audio_url = max(play_info['dash']['audio'], key=by_id)['base_url']
 
             dash_info = {
                 'video_url': video_url,
                 'audio_url': audio_url,
-                'v_path': os.path.join(downloads_dir, f"{filename}_video.m4s"),
-                'a_path': os.path.join(downloads_dir, f"{filename}_audio.m4s")
+                'v_path': base + "_video.m4s",
+                'a_path': base + "_audio.m4s"
             }
-            filepath = os.path.join(downloads_dir, f"{filename}.mp4")
             
         elif 'durl' in play_info:
             download_url = play_info['durl'][0]['url']
-            filepath = os.path.join(downloads_dir, f"{filename}.mp4")
         else:
             self.on_download_error("No download URL found")
             return
@@ -1091,11 +1319,34 @@ class MainWindow(QMainWindow):
         # self.dl_worker.status.connect(self.lbl_status.setText) # lbl_status removed
         self.dl_worker.finished.connect(self.on_download_finished)
         self.dl_worker.error.connect(self.on_download_error)
+        self.dl_worker.prefetch_next.connect(self.prefetch_next_download)
         self.dl_worker.start()
 
+    def prefetch_next_download(self):
+        """Resolve the next queued video's play URL while the current one is still being written"""
+        if not self.video_queue:
+            return
+        queue = self.video_queue
+        bvid = queue[0]
+        
+        def store(info):
+            # Ignore a late answer once the queue has been replaced
+            if self.video_queue is queue:
+                self.current_info_map.setdefault(info['bvid'], info)
+        
+        # Failures are left to process_next_download, which fetches and reports as usual
+        self._submit(self._prefetch_play_url, bvid, self.current_info_map.get(bvid), on_finished=store)
+
+    def _prefetch_play_url(self, bvid, info):
+        # Same qn as process_download_for_info, so its get_play_url call hits the downloader's cache
+        if info is None:
+            info = self.downloader.get_video_info(bvid)
+        self.downloader.get_play_url(info['bvid'], info['cid'], 127)
+        return info
+
     def on_download_finished(self, path):
+        self._pending_download = None
         # One download done, move to next
-        self.current_download_index += 1
         self.process_next_download()
 
 if __name__ == "__main__":